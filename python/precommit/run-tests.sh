@@ -36,7 +36,9 @@ export PYTHONPATH="$(pwd)/rust/out/python:${PYTHONPATH:-}"
 if command -v uv >/dev/null 2>&1; then
     cd python
     uv sync --extra dev  # Install dev dependencies including pytest
-    uv run pytest tests/ -q --tb=short -m "not cross_language"
+    # Spread tests across CPUs; loadfile keeps each file on one worker so
+    # module-scoped fixtures are built once per file, even in class-based modules
+    uv run pytest tests/ -q --tb=short -m "not cross_language" -n auto --dist loadfile --ff
     cd ..
 elif command -v python3 >/dev/null 2>&1; then
     python3 python/tests/run_tests.py
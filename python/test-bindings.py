@@ -23,13 +23,13 @@ Usage:
     ./test-bindings.py
 """
 
-import os
 import sys
+from pathlib import Path
 
 if __name__ == "__main__":
     # Add the tests directory to the path
-    tests_path = os.path.join(os.path.dirname(__file__), "tests")
-    sys.path.insert(0, os.path.abspath(tests_path))
+    tests_path = Path(__file__).resolve().parent / "tests"
+    sys.path.insert(0, str(tests_path))
 
     # Import and run the main test runner
     from run_tests import run_all_tests
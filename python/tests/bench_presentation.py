@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Indicio
+# SPDX-License-Identifier: Apache-2.0 OR MIT
+#
+# This software may be modified and distributed under the terms
+# of either the Apache License, Version 2.0 or the MIT license.
+# See the LICENSE-APACHE and LICENSE-MIT files for details.
+
+"""
+Micro-benchmarks for presentation session calls using pytest-benchmark.
+
+Not collected by default (see python_files); run explicitly, e.g.:
+    uv run pytest tests/bench_presentation.py --benchmark-autosave
+    uv run pytest tests/bench_presentation.py --benchmark-compare \\
+        --benchmark-compare-fail=median:10%
+"""
+
+import pytest
+from utils import FULL_NAME_REQUESTED_ITEMS
+
+# Keep cyclic GC pauses from CBOR buffer churn out of every measured round
+pytestmark = pytest.mark.benchmark(disable_gc=True)
+
+
+def test_bench_key_pair(benchmark, mdl_module):
+    """Benchmark P-256 holder key generation."""
+    key_pair = benchmark(mdl_module.P256KeyPair)
+    assert key_pair is not None
+
+
+def test_bench_generate_test_mdl(benchmark, mdl_module, key_pair):
+    """Benchmark test mDL issuance (MSO construction and issuer signing)."""
+    mdoc = benchmark(mdl_module.generate_test_mdl, key_pair)
+    assert mdoc.doctype() == "org.iso.18013.5.1.mDL"
+
+
+def test_bench_qr_code_uri(benchmark, presentation_session_ro):
+    """Benchmark QR code URI generation (device engagement CBOR + base64)."""
+    presentation_session, _ = presentation_session_ro
+
+    qr_uri = benchmark(presentation_session.get_qr_code_uri)
+    assert qr_uri.startswith("mdoc:")
+
+
+def test_bench_ble_ident(benchmark, presentation_session_ro):
+    """Benchmark BLE identifier retrieval."""
+    presentation_session, _ = presentation_session_ro
+
+    ble_ident = benchmark(presentation_session.get_ble_ident)
+    assert len(ble_ident) > 0
+
+
+def test_bench_establish_session(benchmark, mdl_module, presentation_session_ro):
+    """Benchmark reader session establishment (engagement parsing and request encryption)."""
+    _, qr_uri = presentation_session_ro
+
+    reader_session = benchmark(
+        mdl_module.establish_session, qr_uri, FULL_NAME_REQUESTED_ITEMS, None
+    )
+    assert len(reader_session.request) > 0
+
+
+def test_bench_handle_request(benchmark, mdl_module, test_mdl, uuid_pool):
+    """Benchmark holder-side request processing (decryption and item request parsing)."""
+    presentation_session = mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool))
+    reader_session = mdl_module.establish_session(
+        presentation_session.get_qr_code_uri(), FULL_NAME_REQUESTED_ITEMS, None
+    )
+
+    # Each call starts again from the engaged state, so the same request can be replayed
+    requested_data = benchmark(presentation_session.handle_request, reader_session.request)
+    assert len(requested_data) == 1
+
+
+def test_bench_sign(benchmark, key_pair):
+    """Benchmark P-256 signing of a fixed 256-byte payload."""
+    signature = benchmark(key_pair.sign, bytes(256))
+    assert len(signature) == 64
+
+
+def test_bench_handle_response(benchmark, mdl_module, signed_exchange):
+    """Benchmark reader-side verification (decrypt, parse, issuer and device signatures)."""
+    # handle_response works on a copy of the reader state, so every round verifies afresh
+    result = benchmark(
+        mdl_module.handle_response, signed_exchange.reader_state, signed_exchange.final
+    )
+    assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
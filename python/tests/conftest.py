@@ -9,14 +9,45 @@
 Pytest configuration and fixtures for isomdl-uniffi tests.
 """
 
+import os
 import sys
+import uuid
+from collections import namedtuple
 from pathlib import Path
 
 import pytest
 
 # Ensure we can import utils from the same directory
 sys.path.append(str(Path(__file__).parent))
-from utils import get_mdl_module, get_project_root
+from utils import (
+    FULL_NAME_PERMITTED_ITEMS,
+    FULL_NAME_REQUESTED_ITEMS,
+    get_mdl_module,
+    get_project_root,
+)
+
+Exchange = namedtuple("Exchange", ["qr_uri", "reader_state", "final"])
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="also run tests marked very_slow",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip tests marked very_slow unless --run-slow is given.
+    """
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "very_slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="session")
@@ -38,13 +69,122 @@ def mdl_module(project_root):
     return get_mdl_module(project_root)
 
 
-@pytest.fixture(scope="function")
+def _random_uuid_strings(batch_size=256):
+    """Yield v4 UUID strings, reading entropy for a whole batch at once."""
+    while True:
+        raw = os.urandom(16 * batch_size)
+        for i in range(0, len(raw), 16):
+            yield str(uuid.UUID(bytes=raw[i : i + 16], version=4))
+
+
+@pytest.fixture(scope="session")
+def uuid_pool():
+    """
+    Provide an iterator of session UUID strings; use next(uuid_pool) per session.
+    """
+    return _random_uuid_strings()
+
+
+@pytest.fixture(scope="session")
 def key_pair(mdl_module):
-    """Provide a fresh P256KeyPair for each test that needs one."""
+    """
+    Provide the holder P256KeyPair for the whole run.
+
+    Signing does not change the key, so sharing it is safe. Tests that need a
+    distinct key should use other_key_pair.
+    """
+    return mdl_module.P256KeyPair()
+
+
+@pytest.fixture(scope="session")
+def other_key_pair(mdl_module):
+    """
+    Provide a second P256KeyPair, unrelated to key_pair and test_mdl, for the whole run.
+    """
     return mdl_module.P256KeyPair()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_mdl(mdl_module, key_pair):
-    """Provide a test MDL for each test that needs one."""
+    """
+    Provide the test MDL bound to key_pair for the whole run.
+
+    Presentation sessions only read from the MDL, so each test can still build
+    its own session on top of it.
+    """
     return mdl_module.generate_test_mdl(key_pair)
+
+
+@pytest.fixture(scope="session")
+def mdl_details(test_mdl):
+    """
+    Provide test_mdl.details(), converted from Rust once for the whole run.
+
+    Tests must not mutate the returned dict or its element lists.
+    """
+    return test_mdl.details()
+
+
+@pytest.fixture(scope="module")
+def presentation_session_ro(mdl_module, test_mdl, uuid_pool):
+    """
+    Provide a (presentation_session, qr_uri) pair shared across a test module.
+
+    Only for read-only tests: anything that drives the session through
+    handle_request/generate_response/submit_response must build its own.
+    """
+    presentation_session = mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool))
+    return presentation_session, presentation_session.get_qr_code_uri()
+
+
+def _run_exchange(mdl_module, key_pair, mdoc, session_uuid, requested_items, permitted_items):
+    """Drive one QR-engaged presentation up to the signed final response."""
+    presentation_session = mdl_module.MdlPresentationSession(mdoc, session_uuid)
+    qr_uri = presentation_session.get_qr_code_uri()
+
+    reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+    presentation_session.handle_request(reader_session.request)
+
+    unsigned_response = presentation_session.generate_response(permitted_items)
+    signed_response = key_pair.sign(unsigned_response)
+    final_response = presentation_session.submit_response(signed_response)
+
+    return Exchange(qr_uri, reader_session.state, final_response)
+
+
+@pytest.fixture(scope="session")
+def run_presentation(mdl_module, key_pair, test_mdl, uuid_pool):
+    """
+    Provide run(requested_items, permitted_items) for a complete QR-engaged presentation.
+
+    Drives each session API step from Python on a fresh holder session over
+    test_mdl, signing with key_pair, and returns (final_response, reader_result).
+    Tests that assert on intermediate state should make the calls themselves.
+    """
+
+    def run(requested_items, permitted_items):
+        exchange = _run_exchange(
+            mdl_module, key_pair, test_mdl, next(uuid_pool), requested_items, permitted_items
+        )
+        return exchange.final, mdl_module.handle_response(exchange.reader_state, exchange.final)
+
+    return run
+
+
+@pytest.fixture(scope="module")
+def signed_exchange(mdl_module, key_pair, test_mdl, uuid_pool):
+    """
+    Provide one complete, validly signed full-name presentation as an Exchange.
+
+    handle_response works on a copy of the reader state, so tests may verify
+    the final response (or tampered copies of it) any number of times. The
+    holder session is already spent; tests that submit signatures need their own.
+    """
+    return _run_exchange(
+        mdl_module,
+        key_pair,
+        test_mdl,
+        next(uuid_pool),
+        FULL_NAME_REQUESTED_ITEMS,
+        FULL_NAME_PERMITTED_ITEMS,
+    )
@@ -12,6 +12,7 @@ Test suite for isomdl-uniffi Python bindings.
 This module provides utilities to run the test suite using pytest.
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -40,10 +41,22 @@ def run_all_tests():
     print("🧪 Running tests with pytest...")
     print()
 
+    args = [
+        str(test_dir),
+        "-v",
+        "--tb=short",
+        "--disable-warnings",
+        "-m",
+        "not cross_language",
+        "--ff",
+    ]
+
+    # Spread tests across CPUs when pytest-xdist is installed, as run-tests.sh does
+    if importlib.util.find_spec("xdist") is not None:
+        args += ["-n", "auto", "--dist", "loadfile"]
+
     # Run pytest with configuration
-    exit_code = pytest.main(
-        [str(test_dir), "-v", "--tb=short", "--disable-warnings", "-m", "not cross_language"]
-    )
+    exit_code = pytest.main(args)
 
     success = exit_code == 0
 
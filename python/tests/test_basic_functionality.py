@@ -22,8 +22,8 @@ class TestKeyPairOperations:
         key_pair = mdl_module.P256KeyPair()
 
         assert key_pair is not None
-        assert hasattr(key_pair, "public_jwk")
-        assert hasattr(key_pair, "sign")
+        assert isinstance(key_pair.public_jwk(), str)
+        assert len(key_pair.sign(b"isomdl")) == 64
 
     def test_public_key_jwk_format(self, key_pair):
         """Test that public key JWK is properly formatted."""
@@ -64,10 +64,10 @@ class TestMDLGeneration:
         test_mdl = mdl_module.generate_test_mdl(key_pair)
 
         assert test_mdl is not None
-        assert hasattr(test_mdl, "doctype")
-        assert hasattr(test_mdl, "id")
-        assert hasattr(test_mdl, "key_alias")
-        assert hasattr(test_mdl, "details")
+        assert test_mdl.doctype() == "org.iso.18013.5.1.mDL"
+        assert isinstance(test_mdl.id(), str)
+        assert isinstance(test_mdl.key_alias(), str)
+        assert isinstance(test_mdl.details(), dict)
 
     def test_mdl_document_type(self, test_mdl):
         """Test that MDL has correct document type."""
@@ -103,16 +103,16 @@ class TestMDLGeneration:
 class TestMDLDetails:
     """Test MDL details and attributes."""
 
-    def test_details_structure(self, test_mdl):
+    def test_details_structure(self, mdl_details):
         """Test that MDL details have proper structure."""
-        details = test_mdl.details()
+        details = mdl_details
 
         assert isinstance(details, dict)
         assert len(details) >= 1
 
-    def test_iso_namespace_exists(self, test_mdl):
+    def test_iso_namespace_exists(self, mdl_details):
         """Test that required ISO namespace exists."""
-        details = test_mdl.details()
+        details = mdl_details
 
         required_namespace = "org.iso.18013.5.1"
         assert required_namespace in details
@@ -121,16 +121,14 @@ class TestMDLDetails:
         assert isinstance(namespace_elements, list)
         assert len(namespace_elements) > 0
 
-    def test_iso_namespace_attributes(self, test_mdl):
+    def test_iso_namespace_attributes(self, mdl_details):
         """Test that ISO namespace has required attributes."""
-        details = test_mdl.details()
+        details = mdl_details
         iso_elements = details["org.iso.18013.5.1"]
 
         # Convert to dict for easier validation
         iso_dict = {}
         for element in iso_elements:
-            assert hasattr(element, "identifier")
-            assert hasattr(element, "value")
             assert isinstance(element.identifier, str)
             assert element.value is not None
             iso_dict[element.identifier] = element.value
@@ -147,9 +145,9 @@ class TestMDLDetails:
         assert isinstance(iso_dict["family_name"], str)
         assert isinstance(iso_dict["document_number"], str)
 
-    def test_aamva_namespace_optional(self, test_mdl):
+    def test_aamva_namespace_optional(self, mdl_details):
         """Test that AAMVA namespace is properly structured if present."""
-        details = test_mdl.details()
+        details = mdl_details
 
         if "org.iso.18013.5.1.aamva" in details:
             aamva_elements = details["org.iso.18013.5.1.aamva"]
@@ -158,26 +156,24 @@ class TestMDLDetails:
 
             # Validate structure of first few elements
             for element in aamva_elements[:3]:
-                assert hasattr(element, "identifier")
-                assert hasattr(element, "value")
+                assert isinstance(element.identifier, str)
+                # value is None when the element cannot be represented as JSON
+                assert element.value is None or isinstance(element.value, str)
 
 
 if __name__ == "__main__":
     # Support direct execution for debugging
     import sys
-    from pathlib import Path
 
-    # Try to import bindings
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "rust" / "out" / "python"))
+    import pytest
+    from utils import get_mdl_module
 
+    # Same guarded sys.path setup the mdl_module fixture uses
     try:
-        # Run with pytest
-        import pytest
-
-        import isomdl_uniffi as mdl_module  # noqa: F401
-
-        sys.exit(pytest.main([__file__, "-v"]))
+        get_mdl_module()
     except ImportError as e:
-        print(f"❌ Could not import isomdl_uniffi: {e}")
+        print(f"❌ {e}")
         print("Please run the build script first")
         sys.exit(1)
+
+    sys.exit(pytest.main([__file__, "-v"]))
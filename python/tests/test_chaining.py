@@ -8,8 +8,6 @@ from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509.oid import NameOID
 
-from isomdl_uniffi import Mdoc, MdocVerificationError
-
 
 def generate_key():
     return ec.generate_private_key(ec.SECP256R1())
@@ -102,7 +100,7 @@ def generate_jwk(key):
     )
 
 
-def test_verify_issuer_signature_chaining():
+def test_verify_issuer_signature_chaining(mdl_module):
     # 1. Generate Root CA
     root_key = generate_key()
     root_name = x509.Name(
@@ -154,7 +152,7 @@ def test_verify_issuer_signature_chaining():
     )
 
     # 5. Create mdoc signed by Intermediate CA
-    mdoc = Mdoc.create_and_sign_mdl(
+    mdoc = mdl_module.Mdoc.create_and_sign_mdl(
         mdl_items, None, holder_jwk, intermediate_cert_pem, intermediate_key_pem
     )
 
@@ -164,7 +162,7 @@ def test_verify_issuer_signature_chaining():
     try:
         mdoc.verify_issuer_signature([root_cert_pem], False)
         pytest.fail("Verification should fail when chaining is disabled")
-    except MdocVerificationError:
+    except mdl_module.MdocVerificationError:
         pass  # Expected
 
     # Case B: Chaining Enabled - Should Succeed
@@ -1,7 +1,10 @@
 import json
+import logging
 
 import pytest
 
+logger = logging.getLogger(__name__)
+
 
 @pytest.mark.cross_language
 class TestCrossLanguageVerification:
@@ -38,7 +41,7 @@ class TestCrossLanguageVerification:
         trust_anchor = {"certificate_pem": issuer_cert_pem, "purpose": "Iaca"}
         trust_anchors = [json.dumps(trust_anchor)]
 
-        print(f"Verifying DeviceResponse ({len(device_response_bytes)} bytes)...")
+        logger.debug("Verifying DeviceResponse (%d bytes)...", len(device_response_bytes))
 
         verified_data = mdl_module.verify_oid4vp_response(
             device_response_bytes,
@@ -49,16 +52,16 @@ class TestCrossLanguageVerification:
             False,  # use_intermediate_chaining
         )
 
-        print("Verification successful!")
+        logger.debug("Verification successful!")
 
         # Check that we have the expected data
         # verified_data is MDLReaderVerifiedData record
 
         # Verify authentication status
         if verified_data.issuer_authentication != mdl_module.AuthenticationStatus.VALID:
-            print(f"Issuer Authentication failed. Errors: {verified_data.errors}")
+            logger.warning("Issuer Authentication failed. Errors: %s", verified_data.errors)
         if verified_data.device_authentication != mdl_module.AuthenticationStatus.VALID:
-            print(f"Device Authentication failed. Errors: {verified_data.errors}")
+            logger.warning("Device Authentication failed. Errors: %s", verified_data.errors)
 
         assert verified_data.issuer_authentication == mdl_module.AuthenticationStatus.VALID
         assert verified_data.device_authentication == mdl_module.AuthenticationStatus.VALID
@@ -69,7 +72,7 @@ class TestCrossLanguageVerification:
         family_name_item = namespaces["org.iso.18013.5.1"]["family_name"]
 
         # MDocItem is a UniFfi enum - access the value via index
-        print(f"Family Name Item: {family_name_item}")
+        logger.debug("Family Name Item: %s", family_name_item)
 
         # UniFfi enum variants support __getitem__ to access tuple values
         assert family_name_item[0] == "Doe"
@@ -109,7 +112,9 @@ class TestCrossLanguageVerification:
         trust_anchor = {"certificate_pem": issuer_cert_pem, "purpose": "Iaca"}
         trust_anchors = [json.dumps(trust_anchor)]
 
-        print(f"Verifying Credo OID4VP DeviceResponse ({len(device_response_bytes)} bytes)...")
+        logger.debug(
+            "Verifying Credo OID4VP DeviceResponse (%d bytes)...", len(device_response_bytes)
+        )
 
         verified_data = mdl_module.verify_oid4vp_response(
             device_response_bytes, nonce, client_id, response_uri, trust_anchors, False
@@ -14,6 +14,11 @@ Tests namespace validation, attribute validation, and value type checking.
 import uuid
 
 import pytest
+from utils import (
+    FULL_NAME_PERMITTED_ITEMS,
+    FULL_NAME_REQUESTED_ITEMS,
+    GIVEN_NAME_REQUESTED_ITEMS,
+)
 
 
 class TestNamespaceValidation:
@@ -76,9 +81,9 @@ class TestNamespaceValidation:
             empty_permitted = {}
 
             # May fail or return empty response
-            with pytest.raises((ValueError, RuntimeError, Exception)):
+            with pytest.raises(mdl_module.SignatureError):
                 presentation_session.generate_response(empty_permitted)
-        except (ValueError, RuntimeError):
+        except (mdl_module.MdlReaderSessionError, mdl_module.RequestError):
             # Early rejection is also acceptable
             pass
 
@@ -98,11 +103,7 @@ class TestNamespaceValidation:
         presentation_session.handle_request(reader_session.request)
 
         # Permit only from ISO namespace
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        unsigned_response = presentation_session.generate_response(permitted_items)
+        unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
         signed_response = key_pair.sign(unsigned_response)
         final_response = presentation_session.submit_response(signed_response)
 
@@ -239,9 +240,7 @@ class TestAttributeValues:
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, GIVEN_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Try permitted items with None value
@@ -291,17 +290,11 @@ class TestAttributeValues:
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Correct format: list of strings
-        correct_permitted = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        unsigned = presentation_session.generate_response(correct_permitted)
+        unsigned = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
         signed = key_pair.sign(unsigned)
         final = presentation_session.submit_response(signed)
 
@@ -314,9 +307,7 @@ class TestAttributeValues:
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, GIVEN_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Wrong format: dict instead of list (Python may coerce this)
@@ -335,10 +326,9 @@ class TestAttributeValues:
             # Rejection is also acceptable
             pass
 
-    def test_attribute_value_types_in_mdl(self, mdl_module, key_pair):
+    def test_attribute_value_types_in_mdl(self, test_mdl):
         """Test that MDL contains expected attribute structure."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        details = mdl.details()
+        details = test_mdl.details()
 
         # details is a dict of namespace -> list of Element objects
         assert isinstance(details, dict)
@@ -352,21 +342,20 @@ class TestAttributeValues:
             # Each element should have required properties
             for element in elements:
                 assert element is not None
-                # Element objects have specific structure
-                assert hasattr(element, "identifier")
-                assert hasattr(element, "value")
+                # Element objects have specific structure; value is None when
+                # the element cannot be represented as JSON
+                assert isinstance(element.identifier, str)
+                assert element.value is None or isinstance(element.value, str)
 
 
 class TestDataIntegrity:
     """Test data integrity and consistency checks."""
 
-    def test_mdl_details_consistency(self, mdl_module, key_pair):
+    def test_mdl_details_consistency(self, test_mdl):
         """Test that MDL details remain consistent across calls."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
         # Get details multiple times
-        details1 = mdl.details()
-        details2 = mdl.details()
+        details1 = test_mdl.details()
+        details2 = test_mdl.details()
 
         # Should return same structure
         assert isinstance(details1, dict)
@@ -379,44 +368,36 @@ class TestDataIntegrity:
         for namespace in details1:
             assert len(details1[namespace]) == len(details2[namespace])
 
-    def test_doc_type_consistency(self, mdl_module, key_pair):
+    def test_doc_type_consistency(self, test_mdl):
         """Test that document type is consistent."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
-        doc_type1 = mdl.doctype()
-        doc_type2 = mdl.doctype()
+        doc_type1 = test_mdl.doctype()
+        doc_type2 = test_mdl.doctype()
 
         assert doc_type1 == doc_type2
         assert doc_type1 == "org.iso.18013.5.1.mDL"
 
-    def test_mdl_id_consistency(self, mdl_module, key_pair):
+    def test_mdl_id_consistency(self, test_mdl):
         """Test that MDL ID is consistent."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
-        id1 = mdl.id()
-        id2 = mdl.id()
+        id1 = test_mdl.id()
+        id2 = test_mdl.id()
 
         assert id1 == id2
 
-    def test_serialization_consistency(self, mdl_module, key_pair):
+    def test_serialization_consistency(self, test_mdl):
         """Test that serialization produces consistent results."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
         # Serialize multiple times using json() method
-        json1 = mdl.json()
-        json2 = mdl.json()
+        json1 = test_mdl.json()
+        json2 = test_mdl.json()
 
         # Should produce identical output
         assert json1 == json2
         assert len(json1) > 0
 
-    def test_cbor_serialization_deterministic(self, mdl_module, key_pair):
+    def test_cbor_serialization_deterministic(self, test_mdl):
         """Test that CBOR serialization is deterministic."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
         # Serialize multiple times using stringify() method
-        cbor1 = mdl.stringify()
-        cbor2 = mdl.stringify()
+        cbor1 = test_mdl.stringify()
+        cbor2 = test_mdl.stringify()
 
         # CBOR should be deterministic
         assert cbor1 == cbor2
@@ -11,9 +11,8 @@ Error handling and edge case tests for isomdl-uniffi Python bindings using pytes
 Tests invalid input, error recovery, and edge case scenarios.
 """
 
-import uuid
-
 import pytest
+from utils import FULL_NAME_PERMITTED_ITEMS, FULL_NAME_REQUESTED_ITEMS, GIVEN_NAME_REQUESTED_ITEMS
 
 
 class TestInvalidInput:
@@ -49,15 +48,13 @@ class TestInvalidInput:
             "corrupted-data-here",
         ]
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-
         for invalid_uri in invalid_uris:
             with pytest.raises(mdl_module.MdlReaderSessionError):
-                mdl_module.establish_session(invalid_uri, requested_items, None)
+                mdl_module.establish_session(invalid_uri, GIVEN_NAME_REQUESTED_ITEMS, None)
 
-    def test_invalid_requested_items_empty_namespace(self, mdl_module, test_mdl):
+    def test_invalid_requested_items_empty_namespace(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of empty namespace in request."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -72,11 +69,11 @@ class TestInvalidInput:
             # Rejection is also acceptable
             pass
 
-    def test_invalid_attribute_values(self, mdl_module, test_mdl):
+    def test_invalid_attribute_values(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of invalid attribute values in request."""
         import struct
 
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -92,9 +89,9 @@ class TestInvalidInput:
         with pytest.raises((TypeError, ValueError, RuntimeError, struct.error)):
             mdl_module.establish_session(qr_uri, invalid_request, None)
 
-    def test_oversized_attribute_request(self, mdl_module, test_mdl):
+    def test_oversized_attribute_request(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of requests with many attributes."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -105,32 +102,27 @@ class TestInvalidInput:
         try:
             reader_session = mdl_module.establish_session(qr_uri, large_request, None)
             requested_data = presentation_session.handle_request(reader_session.request)
-            # Should return a list, even if empty or partial
-            assert isinstance(requested_data, list)
-        except Exception as e:
+        except (mdl_module.MdlReaderSessionError, mdl_module.RequestError) as e:
             # Some reasonable error is acceptable
             assert "attribute" in str(e).lower() or "request" in str(e).lower()
+        else:
+            # Should return a list, even if empty or partial
+            assert isinstance(requested_data, list)
 
 
 class TestErrorRecovery:
     """Test error recovery scenarios."""
 
-    def test_recovery_from_invalid_signature(self, mdl_module, test_mdl):
+    def test_recovery_from_invalid_signature(self, mdl_module, test_mdl, uuid_pool):
         """Test that invalid signatures are properly rejected."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        unsigned_response = presentation_session.generate_response(permitted_items)
+        unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
 
         # Create an invalid signature (just random bytes)
         invalid_signature = b"invalid_signature_data_here_" + unsigned_response[:32]
@@ -139,22 +131,18 @@ class TestErrorRecovery:
         with pytest.raises(mdl_module.SignatureError):
             presentation_session.submit_response(invalid_signature)
 
-    def test_recovery_from_wrong_response_order(self, mdl_module, test_mdl):
+    def test_recovery_from_wrong_response_order(self, mdl_module, test_mdl, uuid_pool):
         """Test that responding before handling request is rejected."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         # Try to generate response before handling request
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
         with pytest.raises(mdl_module.SignatureError):
-            presentation_session.generate_response(permitted_items)
+            presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
 
-    def test_recovery_from_invalid_request_data(self, mdl_module, test_mdl):
+    def test_recovery_from_invalid_request_data(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of corrupted request data."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         # Try to handle invalid request data
@@ -167,9 +155,9 @@ class TestErrorRecovery:
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    def test_duplicate_session_ids(self, mdl_module, test_mdl):
+    def test_duplicate_session_ids(self, mdl_module, test_mdl, uuid_pool):
         """Test that duplicate session IDs are handled."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
 
         # Create first session
         session1 = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
@@ -186,25 +174,23 @@ class TestEdgeCases:
             # Rejection is also acceptable
             pass
 
-    def test_null_trust_anchor_registry(self, mdl_module, test_mdl):
+    def test_null_trust_anchor_registry(self, mdl_module, test_mdl, uuid_pool):
         """Test that None/null trust anchor registry is handled."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-
         # None should be acceptable (no trust anchors)
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, GIVEN_NAME_REQUESTED_ITEMS, None)
         assert reader_session is not None
 
         # Empty list should also work
-        reader_session2 = mdl_module.establish_session(qr_uri, requested_items, [])
+        reader_session2 = mdl_module.establish_session(qr_uri, GIVEN_NAME_REQUESTED_ITEMS, [])
         assert reader_session2 is not None
 
-    def test_special_characters_in_namespace(self, mdl_module, test_mdl):
+    def test_special_characters_in_namespace(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of special characters in namespace names."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -226,9 +212,9 @@ class TestEdgeCases:
                 # Rejection of invalid namespaces is acceptable
                 pass
 
-    def test_unicode_attribute_names(self, mdl_module, test_mdl):
+    def test_unicode_attribute_names(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of Unicode characters in attribute names."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -245,40 +231,37 @@ class TestEdgeCases:
         try:
             reader_session = mdl_module.establish_session(qr_uri, unicode_request, None)
             requested_data = presentation_session.handle_request(reader_session.request)
-            # Should handle gracefully, even if attributes don't exist
-            assert isinstance(requested_data, list)
-        except Exception:
+        except (mdl_module.MdlReaderSessionError, mdl_module.RequestError):
             # Some systems may not support Unicode attribute names
-            pass
+            return
 
-    def test_empty_permitted_items(self, mdl_module, test_mdl):
+        # Should handle gracefully, even if attributes don't exist
+        assert isinstance(requested_data, list)
+
+    def test_empty_permitted_items(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of empty permitted items in response."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Try to generate response with empty permitted items
         # This should fail as there are no signature payloads to process
         empty_permitted = {}
 
-        with pytest.raises((ValueError, RuntimeError, Exception)):
+        with pytest.raises(mdl_module.SignatureError):
             presentation_session.generate_response(empty_permitted)
 
-    def test_mismatched_permitted_items(self, mdl_module, key_pair, test_mdl):
+    def test_mismatched_permitted_items(self, mdl_module, key_pair, test_mdl, uuid_pool):
         """Test handling of permitted items that don't match request."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
         # Request specific attributes
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Permit completely different attributes
@@ -294,17 +277,18 @@ class TestEdgeCases:
             # Try to complete the flow
             signed_response = key_pair.sign(unsigned_response)
             response = presentation_session.submit_response(signed_response)
-            result = mdl_module.handle_response(reader_session.state, response)
-
-            # Response should still be valid, even if empty
-            assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
-        except Exception:
+        except mdl_module.SignatureError:
             # Some systems may reject mismatched items
-            pass
+            return
+
+        result = mdl_module.handle_response(reader_session.state, response)
+
+        # Response should still be valid, even if empty
+        assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
 
-    def test_very_long_attribute_names(self, mdl_module, test_mdl):
+    def test_very_long_attribute_names(self, mdl_module, test_mdl, uuid_pool):
         """Test handling of very long attribute names."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
@@ -37,12 +37,23 @@ def test_mdl_serialization_cbor(test_mdl):
     assert len(cbor_str) > 100, f"CBOR too short: {len(cbor_str)}"
 
 
+def test_mdl_serialization_cbor_bytes(mdl_module, test_mdl):
+    """Test raw CBOR serialization and round-trip."""
+    cbor_bytes = test_mdl.cbor_bytes()
+    assert isinstance(cbor_bytes, bytes), "CBOR should be bytes"
+    assert len(cbor_bytes) > 50, f"CBOR too short: {len(cbor_bytes)}"
+
+    decoded = mdl_module.Mdoc.from_cbor_encoded_document(cbor_bytes, test_mdl.key_alias())
+    assert decoded.id() == test_mdl.id(), "Round-tripped MDL should keep its id"
+    assert decoded.doctype() == test_mdl.doctype(), "Round-tripped MDL should keep its doctype"
+
+
 def test_mdl_has_required_methods(test_mdl):
-    """Validate that MDL has all required methods."""
+    """Validate that MDL serialization and doctype methods return strings."""
     assert test_mdl is not None, "Generated MDL should not be None"
-    assert hasattr(test_mdl, "json"), "MDL should have json method"
-    assert hasattr(test_mdl, "stringify"), "MDL should have stringify method"
-    assert hasattr(test_mdl, "doctype"), "MDL should have doctype method"
+    assert isinstance(test_mdl.json(), str), "json() should return a string"
+    assert isinstance(test_mdl.stringify(), str), "stringify() should return a string"
+    assert isinstance(test_mdl.doctype(), str), "doctype() should return a string"
 
 
 def test_mdl_document_type(test_mdl):
@@ -52,9 +63,9 @@ def test_mdl_document_type(test_mdl):
     assert doctype == "org.iso.18013.5.1.mDL", f"Wrong document type: {doctype}"
 
 
-def test_mdl_details_structure(test_mdl):
+def test_mdl_details_structure(mdl_details):
     """Validate MDL details structure and required attributes."""
-    details = test_mdl.details()
+    details = mdl_details
     assert isinstance(details, dict), "Details should be a dict"
     assert len(details) > 0, "Details should not be empty"
 
@@ -67,8 +78,7 @@ def test_mdl_details_structure(test_mdl):
     # Convert to dict for easier validation
     iso_dict = {}
     for element in iso_elements:
-        assert hasattr(element, "identifier"), "Element should have identifier"
-        assert hasattr(element, "value"), "Element should have value"
+        assert isinstance(element.identifier, str), "Element identifier should be a string"
         iso_dict[element.identifier] = element.value
 
     # Validate required attributes
@@ -94,6 +104,16 @@ def test_mdl_cbor_round_trip(test_mdl):
         assert len(cbor_str) > 100, "CBOR string should be substantial"
 
 
+def test_mdl_stringified_round_trip(mdl_module, test_mdl):
+    """Test reconstructing an MDL from its stringified form."""
+    stringified = test_mdl.stringify()
+
+    reconstructed = mdl_module.Mdoc.from_stringified_document(stringified, test_mdl.key_alias())
+    assert reconstructed.id() == test_mdl.id(), "Reconstructed MDL should keep its id"
+    assert reconstructed.doctype() == test_mdl.doctype(), "Reconstructed MDL doctype mismatch"
+    assert reconstructed.key_alias() == test_mdl.key_alias(), "Key alias should be preserved"
+
+
 def test_mdl_id_format(test_mdl):
     """Validate MDL ID format."""
     mdl_id = test_mdl.id()
@@ -12,89 +12,63 @@ OID4VP verification functionality tests for isomdl-uniffi Python bindings.
 
 import hashlib
 
+import pytest
 
-class TestOID4VPVerification:
-    """Test OID4VP stateless verification functionality."""
 
-    def test_verify_oid4vp_response_invalid_cbor(self, mdl_module):
-        """Test verify_oid4vp_response with invalid CBOR data."""
-        invalid_response = b"\x00\x01\x02\x03"  # Invalid CBOR
+class TestOID4VPVerification:
+    """
+    Test OID4VP stateless verification functionality.
+
+    Each case makes a single stateless FFI call, so the sub-cases are
+    parametrized to let pytest-xdist distribute them across workers.
+    """
+
+    @pytest.mark.parametrize(
+        "response",
+        [b"\x00\x01\x02\x03", b""],
+        ids=["invalid_cbor", "empty_response"],
+    )
+    def test_verify_oid4vp_response_unparseable(self, mdl_module, response):
+        """Test verify_oid4vp_response with invalid or empty CBOR data."""
         nonce = "test_nonce_12345"
         client_id = "https://verifier.example.com"
         response_uri = "https://verifier.example.com/response/123"
         trust_anchors = None
 
-        # Should raise an error for invalid CBOR
+        # Should raise an error for unparseable CBOR
         try:
             mdl_module.verify_oid4vp_response(
-                invalid_response, nonce, client_id, response_uri, trust_anchors, False
+                response, nonce, client_id, response_uri, trust_anchors, False
             )
-            raise AssertionError("Expected an exception for invalid CBOR")
+            raise AssertionError("Expected an exception for unparseable response")
         except Exception as e:
             # Verify it's the expected error type
             error_msg = str(e)
             assert "Unable to parse DeviceResponse" in error_msg
 
-    def test_verify_oid4vp_response_empty_response(self, mdl_module):
-        """Test verify_oid4vp_response with empty response."""
-        empty_response = b""
-        nonce = "test_nonce_12345"
-        client_id = "https://verifier.example.com"
-        response_uri = "https://verifier.example.com/response/123"
-        trust_anchors = None
-
+    @pytest.mark.parametrize(
+        "nonce, client_id, response_uri",
+        [
+            ("", "https://verifier.example.com", "https://verifier.example.com/response/123"),
+            ("test_nonce", "", "https://verifier.example.com/response/123"),
+            ("test_nonce", "https://verifier.example.com", ""),
+        ],
+        ids=["empty_nonce", "empty_client_id", "empty_response_uri"],
+    )
+    def test_verify_oid4vp_response_parameter_validation(
+        self, mdl_module, nonce, client_id, response_uri
+    ):
+        """Test parameter validation for verify_oid4vp_response."""
         try:
             mdl_module.verify_oid4vp_response(
-                empty_response, nonce, client_id, response_uri, trust_anchors, False
+                b"\x00\x01", nonce, client_id, response_uri, None, False
             )
-            raise AssertionError("Expected an exception for empty response")
+            # If it doesn't throw an error, it should at least parse the parameters
+            # The CBOR parsing will fail, but parameter validation should work
         except Exception as e:
+            # We expect CBOR parsing to fail, but not parameter validation
             error_msg = str(e)
-            assert "Unable to parse DeviceResponse" in error_msg
-
-    def test_verify_oid4vp_response_parameter_validation(self, mdl_module):
-        """Test parameter validation for verify_oid4vp_response."""
-        # Test with various parameter combinations
-        test_cases = [
-            {
-                "response": b"\x00\x01",
-                "nonce": "",  # Empty nonce
-                "client_id": "https://verifier.example.com",
-                "response_uri": "https://verifier.example.com/response/123",
-                "trust_anchors": None,
-            },
-            {
-                "response": b"\x00\x01",
-                "nonce": "test_nonce",
-                "client_id": "",  # Empty client_id
-                "response_uri": "https://verifier.example.com/response/123",
-                "trust_anchors": None,
-            },
-            {
-                "response": b"\x00\x01",
-                "nonce": "test_nonce",
-                "client_id": "https://verifier.example.com",
-                "response_uri": "",  # Empty response_uri
-                "trust_anchors": None,
-            },
-        ]
-
-        for i, case in enumerate(test_cases):
-            try:
-                mdl_module.verify_oid4vp_response(
-                    case["response"],
-                    case["nonce"],
-                    case["client_id"],
-                    case["response_uri"],
-                    case["trust_anchors"],
-                    False,
-                )
-                # If it doesn't throw an error, it should at least parse the parameters
-                # The CBOR parsing will fail, but parameter validation should work
-            except Exception as e:
-                # We expect CBOR parsing to fail, but not parameter validation
-                error_msg = str(e)
-                assert "Unable to parse DeviceResponse" in error_msg, f"Case {i}: {error_msg}"
+            assert "Unable to parse DeviceResponse" in error_msg, error_msg
 
     def test_oid4vp_session_transcript_construction(self, mdl_module):
         """Test that OID4VP session transcript is constructed correctly."""
@@ -147,55 +121,38 @@ class TestOID4VPVerification:
                 invalid_response, nonce, client_id, response_uri, None, False
             )
             # If somehow this succeeds, verify the structure
-            assert hasattr(result, "verified_response")
-            assert hasattr(result, "issuer_authentication")
-            assert hasattr(result, "device_authentication")
-            assert hasattr(result, "errors")
-            assert hasattr(result, "verified_response_as_json")
+            assert isinstance(result.doc_type, str)
+            assert isinstance(result.verified_response, dict)
+            assert isinstance(result.issuer_authentication, mdl_module.AuthenticationStatus)
+            assert isinstance(result.device_authentication, mdl_module.AuthenticationStatus)
+            assert result.errors is None or isinstance(result.errors, str)
         except Exception as e:
             # Expected to fail with invalid CBOR
             assert "Unable to parse DeviceResponse" in str(e)
 
     def test_authentication_status_enum_values(self, mdl_module):
         """Test that AuthenticationStatus enum values are accessible."""
-        # Verify the AuthenticationStatus enum is available and has expected values
-        assert hasattr(mdl_module, "AuthenticationStatus")
-
         auth_status = mdl_module.AuthenticationStatus
-        assert hasattr(auth_status, "VALID")
-        assert hasattr(auth_status, "INVALID")
-        assert hasattr(auth_status, "UNCHECKED")
-
-        # Test enum value types
-        assert auth_status.VALID == auth_status.VALID
-        assert auth_status.INVALID == auth_status.INVALID
-        assert auth_status.UNCHECKED == auth_status.UNCHECKED
 
-        # Verify they're different values
-        assert auth_status.VALID != auth_status.INVALID
-        assert auth_status.VALID != auth_status.UNCHECKED
-        assert auth_status.INVALID != auth_status.UNCHECKED
+        # Attribute access fails if a member is missing; the set checks they're distinct
+        values = (auth_status.VALID, auth_status.INVALID, auth_status.UNCHECKED)
+        assert len(set(values)) == 3
 
-    def test_verify_oid4vp_response_with_trust_anchors(self, mdl_module):
+    @pytest.mark.parametrize(
+        "trust_anchors",
+        [[], ["not_valid_json"]],
+        ids=["empty_trust_anchors", "invalid_trust_anchor"],
+    )
+    def test_verify_oid4vp_response_with_trust_anchors(self, mdl_module, trust_anchors):
         """Test verify_oid4vp_response with trust anchor configuration."""
         invalid_response = b"\x00\x01\x02"
         nonce = "test_nonce"
         client_id = "https://verifier.example.com"
         response_uri = "https://verifier.example.com/response/123"
 
-        # Test with empty trust anchor list
         try:
             mdl_module.verify_oid4vp_response(
-                invalid_response, nonce, client_id, response_uri, [], False
-            )
-        except Exception as e:
-            assert "Unable to parse DeviceResponse" in str(e)
-
-        # Test with invalid trust anchor format
-        invalid_trust_anchor = ["not_valid_json"]
-        try:
-            mdl_module.verify_oid4vp_response(
-                invalid_response, nonce, client_id, response_uri, invalid_trust_anchor, False
+                invalid_response, nonce, client_id, response_uri, trust_anchors, False
             )
         except Exception as e:
             # Should fail either at trust anchor parsing or CBOR parsing
@@ -207,16 +164,15 @@ class TestOID4VPVerification:
 
     def test_json_serialization_functionality(self, mdl_module):
         """Test JSON serialization related functionality."""
-        # Test that the verified_response_as_json_string function exists
-        # This function is exported at module level
-        assert hasattr(mdl_module, "verified_response_as_json_string")
-
-        # We can't easily test this without a valid MDLReaderResponseData,
-        # but we can verify it's callable and has the right signature
+        # This function is exported at module level. We can't easily test it without a
+        # valid MDLReaderResponseData, but we can verify it exists and is callable
         func = mdl_module.verified_response_as_json_string
         assert callable(func)
 
-    def test_oid4vp_parameter_types(self, mdl_module):
+    @pytest.mark.parametrize(
+        "trust_anchor_registry", [None, []], ids=["no_registry", "empty_registry"]
+    )
+    def test_oid4vp_parameter_types(self, mdl_module, trust_anchor_registry):
         """Test that OID4VP parameters accept correct types."""
         # Test that the function accepts the expected parameter types
         test_params = {
@@ -224,7 +180,7 @@ class TestOID4VPVerification:
             "nonce": "test_nonce",  # str
             "client_id": "https://verifier.example.com",  # str
             "response_uri": "https://verifier.example.com/response/123",  # str
-            "trust_anchor_registry": None,  # Optional[List[str]]
+            "trust_anchor_registry": trust_anchor_registry,  # Optional[List[str]]
             "use_intermediate_chaining": False,  # bool
         }
 
@@ -233,10 +189,3 @@ class TestOID4VPVerification:
         except Exception as e:
             # Should fail at CBOR parsing, not parameter type validation
             assert "Unable to parse DeviceResponse" in str(e)
-
-        # Test with trust_anchor_registry as empty list
-        test_params["trust_anchor_registry"] = []
-        try:
-            mdl_module.verify_oid4vp_response(**test_params)
-        except Exception as e:
-            assert "Unable to parse DeviceResponse" in str(e)
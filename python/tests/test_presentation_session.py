@@ -10,55 +10,47 @@
 Presentation session tests for isomdl-uniffi Python bindings using pytest.
 """
 
-import uuid
+from utils import FULL_NAME_PERMITTED_ITEMS, FULL_NAME_REQUESTED_ITEMS
 
+# Attributes requested by the reader and permitted by the holder in the full flow
+EXPECTED_ATTRS = frozenset({"family_name", "given_name"})
 
-def test_presentation_session_creation(mdl_module, test_mdl):
+
+def test_presentation_session_creation(mdl_module, test_mdl, uuid_pool):
     """Test basic presentation session creation."""
-    session_uuid = str(uuid.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     assert presentation_session is not None
 
 
-def test_qr_code_uri_generation(mdl_module, test_mdl):
+def test_qr_code_uri_generation(presentation_session_ro):
     """Test QR code URI generation."""
-    session_uuid = str(uuid.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
+    presentation_session, _ = presentation_session_ro
 
     qr_uri = presentation_session.get_qr_code_uri()
     assert isinstance(qr_uri, str), "QR URI should be a string"
     assert len(qr_uri) > 0, "QR URI should not be empty"
 
 
-def test_ble_identifier_generation(mdl_module, test_mdl):
+def test_ble_identifier_generation(presentation_session_ro):
     """Test BLE identifier generation."""
-    session_uuid = str(uuid.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
+    presentation_session, _ = presentation_session_ro
 
     ble_ident = presentation_session.get_ble_ident()
     assert isinstance(ble_ident, bytes), "BLE identifier should be bytes"
     assert len(ble_ident) > 0, "BLE identifier should not be empty"
 
 
-def test_handle_request_structure(mdl_module, test_mdl):
+def test_handle_request_structure(mdl_module, test_mdl, uuid_pool):
     """Test handling presentation request and validate structure."""
-    session_uuid = str(uuid.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     qr_uri = presentation_session.get_qr_code_uri()
 
     # Create a reader session to generate a proper request
-    requested_items = {
-        "org.iso.18013.5.1": {
-            "family_name": True,
-            "given_name": True,
-        }
-    }
-
-    reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+    reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
 
     assert reader_session is not None, "Reader session should not be None"
-    assert hasattr(reader_session, "request"), "Reader session should have request"
-    assert hasattr(reader_session, "state"), "Reader session should have state"
     assert isinstance(reader_session.request, bytes), "Request should be bytes"
     assert len(reader_session.request) > 0, "Request should not be empty"
 
@@ -69,8 +61,6 @@ def test_handle_request_structure(mdl_module, test_mdl):
     assert len(requested_data) == 1, f"Should have exactly 1 document, got {len(requested_data)}"
 
     doc_request = requested_data[0]
-    assert hasattr(doc_request, "doc_type"), "Document request should have doc_type"
-    assert hasattr(doc_request, "namespaces"), "Document request should have namespaces"
     assert doc_request.doc_type == "org.iso.18013.5.1.mDL", (
         f"Wrong doc type: {doc_request.doc_type}"
     )
@@ -80,71 +70,48 @@ def test_handle_request_structure(mdl_module, test_mdl):
     iso_namespace = doc_request.namespaces["org.iso.18013.5.1"]
 
     # Validate requested attributes match what we requested
-    expected_attrs = {"family_name", "given_name"}
-    actual_attrs = set(iso_namespace.keys())
-    assert actual_attrs == expected_attrs, f"Expected {expected_attrs}, got {actual_attrs}"
+    assert iso_namespace.keys() == EXPECTED_ATTRS, (
+        f"Expected {sorted(EXPECTED_ATTRS)}, got {sorted(iso_namespace)}"
+    )
 
     # Validate all attributes are marked as required
-    for attr in expected_attrs:
+    for attr in EXPECTED_ATTRS:
         assert iso_namespace[attr] is True, f"Attribute {attr} should be required"
 
 
-def test_generate_response(mdl_module, key_pair, test_mdl):
+def test_generate_response(mdl_module, key_pair, test_mdl, uuid_pool):
     """Test generating presentation response."""
-    session_uuid = str(uuid.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     qr_uri = presentation_session.get_qr_code_uri()
 
-    requested_items = {
-        "org.iso.18013.5.1": {
-            "family_name": True,
-            "given_name": True,
-        }
-    }
-
-    reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+    reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
     presentation_session.handle_request(reader_session.request)
 
     # Generate response with permitted items
-    permitted_items = {
-        "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["family_name", "given_name"]}
-    }
-
-    unsigned_response = presentation_session.generate_response(permitted_items)
+    unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
 
     assert isinstance(unsigned_response, bytes), "Response should be bytes"
-    assert len(unsigned_response) > 0, "Response should not be empty"
     assert len(unsigned_response) > 10, f"Response too short: {len(unsigned_response)}"
 
 
-def test_complete_presentation_workflow(mdl_module, key_pair, test_mdl):
+def test_complete_presentation_workflow(mdl_module, key_pair, test_mdl, uuid_pool):
     """Test complete presentation workflow from session to verified response."""
-    session_uuid = str(uuid.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     qr_uri = presentation_session.get_qr_code_uri()
 
     # Create reader session and request
-    requested_items = {
-        "org.iso.18013.5.1": {
-            "family_name": True,
-            "given_name": True,
-        }
-    }
-
-    reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+    reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
     presentation_session.handle_request(reader_session.request)
 
     # Generate and sign response
-    permitted_items = {
-        "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["family_name", "given_name"]}
-    }
-
-    unsigned_response = presentation_session.generate_response(permitted_items)
+    unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
     signed_response = key_pair.sign(unsigned_response)
 
     assert isinstance(signed_response, bytes), "Signed response should be bytes"
-    assert len(signed_response) > 0, "Signed response should not be empty"
-    assert signed_response != unsigned_response, "Signed response should differ from unsigned"
+    # P256KeyPair.sign returns the fixed-size raw r || s signature, not the payload
+    assert len(signed_response) == 64, f"Expected 64-byte signature, got {len(signed_response)}"
 
     # Submit the signed response
     final_response = presentation_session.submit_response(signed_response)
@@ -156,8 +123,6 @@ def test_complete_presentation_workflow(mdl_module, key_pair, test_mdl):
     result = mdl_module.handle_response(reader_session.state, final_response)
 
     assert result is not None, "Response handling result should not be None"
-    assert hasattr(result, "device_authentication"), "Result should have device_authentication"
-    assert hasattr(result, "verified_response"), "Result should have verified_response"
 
     # Validate authentication status
     auth_status = result.device_authentication
@@ -172,18 +137,15 @@ def test_complete_presentation_workflow(mdl_module, key_pair, test_mdl):
 
     # Validate response contains only permitted attributes
     response_attrs = verified_response["org.iso.18013.5.1"]
-    expected_response_attrs = {"family_name", "given_name"}
-    actual_response_attrs = set(response_attrs.keys())
-    assert actual_response_attrs == expected_response_attrs, (
-        f"Expected {expected_response_attrs}, got {actual_response_attrs}"
+    assert response_attrs.keys() == EXPECTED_ATTRS, (
+        f"Expected {sorted(EXPECTED_ATTRS)}, got {sorted(response_attrs)}"
     )
 
     # Validate attribute values exist
-    for attr in expected_response_attrs:
+    for attr in EXPECTED_ATTRS:
         attr_value = response_attrs[attr]
-        assert attr_value is not None, f"Attribute {attr} should have a value"
-        # Extract the actual value (it's wrapped in an MDocItem)
-        if hasattr(attr_value, "__len__") and len(attr_value) > 0:
-            actual_value = attr_value[0]
-            assert actual_value is not None, f"Attribute {attr} inner value should not be None"
-            assert len(str(actual_value)) > 0, f"Attribute {attr} should not be empty"
+        # Names are MDocItem.TEXT variants; index 0 is the wrapped string
+        assert attr_value.is_text(), f"Attribute {attr} should be a text MDocItem"
+        actual_value = attr_value[0]
+        assert isinstance(actual_value, str), f"Attribute {attr} should wrap a string"
+        assert len(actual_value) > 0, f"Attribute {attr} should not be empty"
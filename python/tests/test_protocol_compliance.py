@@ -14,16 +14,21 @@ Tests ISO 18013-5 message formats, encoding compliance, and identifier formats.
 import json
 import uuid
 
+import pytest
+from utils import (
+    FULL_NAME_PERMITTED_ITEMS,
+    FULL_NAME_REQUESTED_ITEMS,
+    GIVEN_NAME_PERMITTED_ITEMS,
+    GIVEN_NAME_REQUESTED_ITEMS,
+)
+
 
 class TestMessageFormats:
     """Test ISO 18013-5 message format compliance."""
 
-    def test_qr_code_uri_structure(self, mdl_module, test_mdl):
+    def test_qr_code_uri_structure(self, presentation_session_ro):
         """Test that QR code URI follows expected structure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-
-        qr_uri = presentation_session.get_qr_code_uri()
+        _, qr_uri = presentation_session_ro
 
         # QR URI should be a non-empty string
         assert isinstance(qr_uri, str)
@@ -32,61 +37,49 @@ class TestMessageFormats:
         # Should start with mdoc: scheme
         assert qr_uri.startswith("mdoc:")
 
-    def test_device_request_structure(self, mdl_module, test_mdl):
-        """Test that device request follows expected structure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
+    @pytest.mark.parametrize(
+        "requested_items",
+        [
+            {"org.iso.18013.5.1": {"given_name": True, "family_name": True}},
+            {"org.iso.18013.5.1": {"given_name": True}},
+            # Structure: Dict[namespace, Dict[attribute, intent_to_retain]]
+            {
+                "org.iso.18013.5.1": {
+                    "given_name": True,
+                    "family_name": True,
+                    "birth_date": False,  # Optional
+                }
+            },
+        ],
+        ids=["full", "single", "optional"],
+    )
+    def test_request_shape_accepted(self, mdl_module, test_mdl, uuid_pool, requested_items):
+        """Test that device requests are built and parsed for each supported request shape."""
+        presentation_session = mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool))
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
         reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
 
         # Request should be bytes (CBOR encoded)
         assert isinstance(reader_session.request, bytes)
         assert len(reader_session.request) > 0
 
-    def test_device_response_structure(self, mdl_module, key_pair, test_mdl):
-        """Test that device response follows expected structure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
+        # Namespaces, attributes and intent_to_retain flags should reach the holder intact
+        requested_data = presentation_session.handle_request(reader_session.request)
+        assert len(requested_data) == 1
+        assert requested_data[0].namespaces == requested_items
 
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        presentation_session.handle_request(reader_session.request)
-
-        permitted_items = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
-
-        unsigned_response = presentation_session.generate_response(permitted_items)
-        signed_response = key_pair.sign(unsigned_response)
-        final_response = presentation_session.submit_response(signed_response)
+    def test_device_response_structure(self, run_presentation):
+        """Test that device response follows expected structure."""
+        final_response, _ = run_presentation(GIVEN_NAME_REQUESTED_ITEMS, GIVEN_NAME_PERMITTED_ITEMS)
 
         # Response should be bytes (CBOR encoded)
         assert isinstance(final_response, bytes)
         assert len(final_response) > 0
 
-    def test_verified_response_structure(self, mdl_module, key_pair, test_mdl):
+    def test_verified_response_structure(self, run_presentation):
         """Test that verified response has expected structure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        presentation_session.handle_request(reader_session.request)
-
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        unsigned_response = presentation_session.generate_response(permitted_items)
-        signed_response = key_pair.sign(unsigned_response)
-        final_response = presentation_session.submit_response(signed_response)
-
-        result = mdl_module.handle_response(reader_session.state, final_response)
+        _, result = run_presentation(FULL_NAME_REQUESTED_ITEMS, FULL_NAME_PERMITTED_ITEMS)
 
         # Verified response should be a dictionary of parsed data
         assert isinstance(result.verified_response, dict)
@@ -105,9 +98,8 @@ class TestEncodingCompliance:
         cbor_str = test_mdl.stringify()
 
         assert isinstance(cbor_str, str)
-        assert len(cbor_str) > 0
         # CBOR should be longer than just a few bytes
-        assert len(cbor_str) > 50
+        assert len(cbor_str) > 50, f"CBOR encoding too short: {len(cbor_str)}"
 
     def test_json_encoding(self, test_mdl):
         """Test that JSON encoding is valid."""
@@ -121,31 +113,26 @@ class TestEncodingCompliance:
         assert isinstance(parsed, dict)
         assert len(parsed) > 0
 
-    def test_json_special_characters(self, mdl_module, key_pair):
+    def test_json_special_characters(self, test_mdl):
         """Test JSON encoding handles special characters."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        json_str = mdl.json()
+        json_str = test_mdl.json()
 
         # Should be valid JSON even with special chars in data
         parsed = json.loads(json_str)
         assert isinstance(parsed, dict)
 
-    def test_cbor_determinism(self, mdl_module, key_pair):
+    def test_cbor_determinism(self, test_mdl):
         """Test that CBOR encoding is deterministic."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
-        cbor1 = mdl.stringify()
-        cbor2 = mdl.stringify()
+        cbor1 = test_mdl.stringify()
+        cbor2 = test_mdl.stringify()
 
         # Should produce identical output
         assert cbor1 == cbor2
 
-    def test_json_determinism(self, mdl_module, key_pair):
+    def test_json_determinism(self, test_mdl):
         """Test that JSON encoding is deterministic."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-
-        json1 = mdl.json()
-        json2 = mdl.json()
+        json1 = test_mdl.json()
+        json2 = test_mdl.json()
 
         # Should produce identical output
         assert json1 == json2
@@ -154,43 +141,38 @@ class TestEncodingCompliance:
 class TestIdentifierFormats:
     """Test format compliance of identifiers."""
 
-    def test_session_uuid_format(self, mdl_module, test_mdl):
+    def test_session_uuid_format(self, mdl_module, test_mdl, uuid_pool):
         """Test that session UUIDs are valid."""
         # Create multiple sessions with valid UUIDs
         for _ in range(5):
-            session_uuid = str(uuid.uuid4())
+            session_uuid = next(uuid_pool)
             session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
             qr_uri = session.get_qr_code_uri()
             assert qr_uri is not None
             assert len(qr_uri) > 0
 
-    def test_mdl_id_format(self, mdl_module, key_pair):
+    def test_mdl_id_format(self, test_mdl):
         """Test that MDL ID has expected format."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        mdl_id = mdl.id()
+        mdl_id = test_mdl.id()
 
-        # ID should be a string
-        assert isinstance(mdl_id, str)
-        assert len(mdl_id) > 0
-
-        # Test MDL has specific ID format (UUID)
+        # ID should be a UUID string, with or without dashes
         # Format: "00000000-0000-0000-0000-000000000000" for test data
-        assert "-" in mdl_id or len(mdl_id) == 32  # UUID with or without dashes
+        assert isinstance(mdl_id, str)
+        assert len(mdl_id) in (32, 36), f"Unexpected MDL id length {len(mdl_id)}"
+        uuid.UUID(mdl_id)  # Raises ValueError on non-hex content
 
-    def test_mdl_key_alias_format(self, mdl_module, key_pair):
+    def test_mdl_key_alias_format(self, test_mdl):
         """Test that key alias has expected format."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        key_alias = mdl.key_alias()
+        key_alias = test_mdl.key_alias()
 
         # Key alias should be a string
         assert isinstance(key_alias, str)
         assert len(key_alias) > 0
 
-    def test_ble_identifier_format(self, mdl_module, test_mdl):
+    def test_ble_identifier_format(self, presentation_session_ro):
         """Test that BLE identifier has correct format."""
-        session_uuid = str(uuid.uuid4())
-        session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
+        session, _ = presentation_session_ro
 
         ble_ident = session.get_ble_ident()
 
@@ -202,10 +184,9 @@ class TestIdentifierFormats:
         # Implementation may vary, but should be reasonable length
         assert len(ble_ident) <= 256  # Sanity check
 
-    def test_document_type_format(self, mdl_module, key_pair):
+    def test_document_type_format(self, test_mdl):
         """Test that document type follows ISO 18013-5 format."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        doctype = mdl.doctype()
+        doctype = test_mdl.doctype()
 
         # Should be the standard MDL doctype
         assert doctype == "org.iso.18013.5.1.mDL"
@@ -214,29 +195,13 @@ class TestIdentifierFormats:
         assert doctype.startswith("org.")
         assert "." in doctype
 
-    def test_namespace_format_validation(self, mdl_module, test_mdl):
-        """Test that namespaces follow expected format."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        # Test standard ISO namespace
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        assert reader_session is not None
-
-        # Namespace in request should be preserved
-        presentation_session.handle_request(reader_session.request)
-
 
 class TestDataStructures:
     """Test compliance of data structures."""
 
-    def test_mdl_details_structure(self, mdl_module, key_pair):
+    def test_mdl_details_structure(self, mdl_details):
         """Test that MDL details follow expected structure."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        details = mdl.details()
+        details = mdl_details
 
         # Should be a dictionary of namespaces
         assert isinstance(details, dict)
@@ -251,10 +216,9 @@ class TestDataStructures:
             assert isinstance(elements, list)
             assert len(elements) > 0
 
-    def test_element_structure(self, mdl_module, key_pair):
+    def test_element_structure(self, mdl_details):
         """Test that Element objects have expected structure."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        details = mdl.details()
+        details = mdl_details
 
         # Get elements from ISO namespace
         iso_elements = details.get("org.iso.18013.5.1", [])
@@ -262,58 +226,30 @@ class TestDataStructures:
 
         # Each element should have identifier and value
         for element in iso_elements:
-            assert hasattr(element, "identifier")
-            assert hasattr(element, "value")
+            # value is None when the element cannot be represented as JSON
+            assert element.value is None or isinstance(element.value, str)
 
             # Identifier should be a string
             identifier = element.identifier
             assert isinstance(identifier, str)
             assert len(identifier) > 0
 
-    def test_requested_items_structure(self, mdl_module, test_mdl):
-        """Test that requested items follow expected structure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        # Structure: Dict[namespace, Dict[attribute, bool]]
-        requested_items = {
-            "org.iso.18013.5.1": {
-                "given_name": True,
-                "family_name": True,
-                "birth_date": False,  # Optional
-            }
-        }
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        assert reader_session is not None
-
-    def test_permitted_items_structure(self, mdl_module, test_mdl):
+    def test_permitted_items_structure(self, mdl_module, test_mdl, uuid_pool):
         """Test that permitted items follow expected structure."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
         presentation_session.handle_request(reader_session.request)
 
         # Structure: Dict[doctype, Dict[namespace, List[attribute]]]
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        unsigned = presentation_session.generate_response(permitted_items)
+        unsigned = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
         assert isinstance(unsigned, bytes)
 
     def test_authentication_status_enum(self, mdl_module):
         """Test that AuthenticationStatus enum is properly defined."""
-        # Should have VALID status
-        assert hasattr(mdl_module, "AuthenticationStatus")
-        assert hasattr(mdl_module.AuthenticationStatus, "VALID")
-
-        # Should be usable in comparisons
+        # Should have VALID status, usable in comparisons
         status = mdl_module.AuthenticationStatus.VALID
         assert status is not None
 
@@ -321,10 +257,10 @@ class TestDataStructures:
 class TestProtocolWorkflows:
     """Test complete protocol workflows for compliance."""
 
-    def test_full_protocol_workflow(self, mdl_module, key_pair, test_mdl):
+    def test_full_protocol_workflow(self, mdl_module, key_pair, test_mdl, uuid_pool):
         """Test complete ISO 18013-5 protocol workflow."""
         # 1. Holder creates presentation session
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         # 2. Holder generates QR code
@@ -332,19 +268,13 @@ class TestProtocolWorkflows:
         assert len(qr_uri) > 0
 
         # 3. Reader scans QR and establishes session
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
 
         # 4. Holder receives and processes request
         presentation_session.handle_request(reader_session.request)
 
-        # 5. Holder selects attributes to share
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-
-        # 6. Holder generates unsigned response
-        unsigned_response = presentation_session.generate_response(permitted_items)
+        # 5-6. Holder selects attributes to share and generates unsigned response
+        unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
 
         # 7. Holder signs response
         signed_response = key_pair.sign(unsigned_response)
@@ -359,12 +289,8 @@ class TestProtocolWorkflows:
         assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
         assert len(result.verified_response) > 0
 
-    def test_protocol_workflow_with_partial_disclosure(self, mdl_module, key_pair, test_mdl):
+    def test_protocol_workflow_with_partial_disclosure(self, mdl_module, run_presentation):
         """Test protocol workflow with partial attribute disclosure."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
         # Reader requests multiple attributes
         requested_items = {
             "org.iso.18013.5.1": {
@@ -375,9 +301,6 @@ class TestProtocolWorkflows:
             }
         }
 
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        presentation_session.handle_request(reader_session.request)
-
         # Holder only permits subset
         permitted_items = {
             "org.iso.18013.5.1.mDL": {
@@ -386,11 +309,7 @@ class TestProtocolWorkflows:
             }
         }
 
-        unsigned_response = presentation_session.generate_response(permitted_items)
-        signed_response = key_pair.sign(unsigned_response)
-        final_response = presentation_session.submit_response(signed_response)
-
-        result = mdl_module.handle_response(reader_session.state, final_response)
+        _, result = run_presentation(requested_items, permitted_items)
 
         # Should still verify successfully
         assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
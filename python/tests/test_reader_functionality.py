@@ -10,88 +10,93 @@
 Reader functionality tests for isomdl-uniffi Python bindings using pytest.
 """
 
-import uuid as uuid_module
+import re
+
+import pytest
+from utils import FULL_NAME_REQUESTED_ITEMS
+
+# Canonical lowercase, hyphenated UUID string form
+CANONICAL_UUID_RE = re.compile(r"\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
+
+# Wider request used to exercise session establishment
+ESTABLISHMENT_REQUESTED_ITEMS = {
+    "org.iso.18013.5.1": {
+        "family_name": True,
+        "given_name": True,
+        "birth_date": True,
+        "issue_date": True,
+        "expiry_date": True,
+        "document_number": True,
+    }
+}
+
+# Request and matching holder permit for the full reader workflow
+WORKFLOW_REQUESTED_ITEMS = {
+    "org.iso.18013.5.1": {
+        "family_name": True,
+        "given_name": True,
+        "birth_date": True,
+        "document_number": True,
+    }
+}
+WORKFLOW_PERMITTED_ITEMS = {
+    "org.iso.18013.5.1.mDL": {
+        "org.iso.18013.5.1": list(WORKFLOW_REQUESTED_ITEMS["org.iso.18013.5.1"])
+    }
+}
+
+
+@pytest.fixture(scope="module")
+def session_data(mdl_module, presentation_session_ro):
+    """
+    Provide reader session data established once per module.
+
+    Only for tests that inspect the session data; anything that drives the
+    presentation session must establish its own.
+    """
+    _, qr_uri = presentation_session_ro
+    return mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
 
 
-def test_reader_session_establishment(mdl_module, test_mdl):
+def test_reader_session_establishment(mdl_module, test_mdl, uuid_pool):
     """Test establishing a reader session with validation."""
     # Create a presentation session to get a valid QR code URI
-    session_uuid = str(uuid_module.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     test_uri = presentation_session.get_qr_code_uri()
 
-    # Define what data elements to request
-    requested_items = {
-        "org.iso.18013.5.1": {
-            "family_name": True,
-            "given_name": True,
-            "birth_date": True,
-            "issue_date": True,
-            "expiry_date": True,
-            "document_number": True,
-        }
-    }
-
     # Establish reader session
     session_data = mdl_module.establish_session(
         uri=test_uri,
-        requested_items=requested_items,
+        requested_items=ESTABLISHMENT_REQUESTED_ITEMS,
         trust_anchor_registry=[],  # Empty trust anchor list for test
     )
 
     assert session_data is not None, "Session data should not be None"
-    assert hasattr(session_data, "uuid"), "Session data should have uuid"
-    assert hasattr(session_data, "request"), "Session data should have request"
-    assert hasattr(session_data, "ble_ident"), "Session data should have ble_ident"
-    assert hasattr(session_data, "state"), "Session data should have state"
+    assert isinstance(session_data.uuid, str), "Session UUID should be a string"
+    assert isinstance(session_data.request, bytes), "Request should be bytes"
+    assert isinstance(session_data.ble_ident, bytes), "BLE identifier should be bytes"
+    assert session_data.state is not None, "Session manager should not be None"
 
 
-def test_reader_session_uuid_format(mdl_module, test_mdl):
+def test_reader_session_uuid_format(session_data):
     """Validate session UUID format."""
-    session_uuid = str(uuid_module.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-    test_uri = presentation_session.get_qr_code_uri()
-
-    requested_items = {"org.iso.18013.5.1": {"family_name": True, "given_name": True}}
-
-    session_data = mdl_module.establish_session(test_uri, requested_items, [])
-
-    # Validate session UUID format
-    try:
-        uuid_obj = uuid_module.UUID(session_data.uuid)
-        assert str(uuid_obj) == session_data.uuid, "Invalid UUID format"
-    except ValueError:
-        raise AssertionError(f"Session UUID is not valid: {session_data.uuid}")
+    # Validate session UUID is in canonical lowercase hyphenated form
+    assert CANONICAL_UUID_RE.match(session_data.uuid), (
+        f"Session UUID is not valid: {session_data.uuid}"
+    )
 
 
-def test_reader_request_data_structure(mdl_module, test_mdl):
+def test_reader_request_data_structure(session_data):
     """Validate reader request data structure."""
-    session_uuid = str(uuid_module.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-    test_uri = presentation_session.get_qr_code_uri()
-
-    requested_items = {"org.iso.18013.5.1": {"family_name": True, "given_name": True}}
-
-    session_data = mdl_module.establish_session(test_uri, requested_items, [])
-
     # Validate request data
     assert isinstance(session_data.request, bytes), "Request should be bytes"
-    assert len(session_data.request) > 0, "Request should not be empty"
-    assert len(session_data.request) < 10000, (
-        f"Request suspiciously large: {len(session_data.request)}"
-    )
+    request_len = len(session_data.request)
+    assert 0 < request_len < 10000, f"Request should be non-empty and modest, got {request_len}"
 
 
-def test_reader_ble_identifier(mdl_module, test_mdl):
+def test_reader_ble_identifier(session_data):
     """Validate BLE identifier structure."""
-    session_uuid = str(uuid_module.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-    test_uri = presentation_session.get_qr_code_uri()
-
-    requested_items = {"org.iso.18013.5.1": {"family_name": True, "given_name": True}}
-
-    session_data = mdl_module.establish_session(test_uri, requested_items, [])
-
     # Validate BLE identifier
     assert isinstance(session_data.ble_ident, bytes), "BLE identifier should be bytes"
     assert len(session_data.ble_ident) == 16, (
@@ -99,40 +104,22 @@ def test_reader_ble_identifier(mdl_module, test_mdl):
     )
 
 
-def test_reader_session_manager(mdl_module, test_mdl):
+def test_reader_session_manager(session_data):
     """Validate session manager exists."""
-    session_uuid = str(uuid_module.uuid4())
-    presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-    test_uri = presentation_session.get_qr_code_uri()
-
-    requested_items = {"org.iso.18013.5.1": {"family_name": True, "given_name": True}}
-
-    session_data = mdl_module.establish_session(test_uri, requested_items, [])
-
     # Validate session manager
     session_manager = session_data.state
     assert session_manager is not None, "Session manager should not be None"
 
 
-def test_complete_reader_workflow(mdl_module, key_pair, test_mdl):
+def test_complete_reader_workflow(mdl_module, key_pair, test_mdl, uuid_pool):
     """Test complete reader workflow from session to verified response."""
     # Setup presentation session
-    session_uuid = str(uuid_module.uuid4())
+    session_uuid = next(uuid_pool)
     presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
     test_uri = presentation_session.get_qr_code_uri()
 
-    # Define requested items
-    requested_items = {
-        "org.iso.18013.5.1": {
-            "family_name": True,
-            "given_name": True,
-            "birth_date": True,
-            "document_number": True,
-        }
-    }
-
     # Establish reader session
-    session_data = mdl_module.establish_session(test_uri, requested_items, [])
+    session_data = mdl_module.establish_session(test_uri, WORKFLOW_REQUESTED_ITEMS, [])
 
     # Handle the request on the presentation side
     requested_data = presentation_session.handle_request(session_data.request)
@@ -142,8 +129,6 @@ def test_complete_reader_workflow(mdl_module, key_pair, test_mdl):
     assert len(requested_data) > 0, "Should have at least one document request"
 
     doc_request = requested_data[0]
-    assert hasattr(doc_request, "doc_type"), "Document request should have doc_type"
-    assert hasattr(doc_request, "namespaces"), "Document request should have namespaces"
     assert doc_request.doc_type == "org.iso.18013.5.1.mDL", (
         f"Wrong doc type: {doc_request.doc_type}"
     )
@@ -153,26 +138,22 @@ def test_complete_reader_workflow(mdl_module, key_pair, test_mdl):
     iso_namespace = doc_request.namespaces["org.iso.18013.5.1"]
 
     # Verify all requested attributes are present
-    for attr_name in requested_items["org.iso.18013.5.1"]:
-        assert attr_name in iso_namespace, f"Missing requested attribute: {attr_name}"
-        assert iso_namespace[attr_name] is True, f"Attribute {attr_name} should be required"
+    requested_attrs = WORKFLOW_REQUESTED_ITEMS["org.iso.18013.5.1"]
+    missing = requested_attrs.keys() - iso_namespace.keys()
+    assert not missing, f"Missing requested attributes: {sorted(missing)}"
+    not_required = [attr for attr in requested_attrs if iso_namespace[attr] is not True]
+    assert not not_required, f"Attributes should be required: {not_required}"
 
     # Generate and validate response
-    permitted_items = {
-        "org.iso.18013.5.1.mDL": {
-            "org.iso.18013.5.1": list(requested_items["org.iso.18013.5.1"].keys())
-        }
-    }
-
-    unsigned_response = presentation_session.generate_response(permitted_items)
+    unsigned_response = presentation_session.generate_response(WORKFLOW_PERMITTED_ITEMS)
     assert isinstance(unsigned_response, bytes), "Unsigned response should be bytes"
     assert len(unsigned_response) > 0, "Unsigned response should not be empty"
 
     # Sign the response
     signed_response = key_pair.sign(unsigned_response)
     assert isinstance(signed_response, bytes), "Signed response should be bytes"
-    assert len(signed_response) > 0, "Signed response should not be empty"
-    assert signed_response != unsigned_response, "Signed response should differ from unsigned"
+    # P256KeyPair.sign returns the fixed-size raw r || s signature, not the payload
+    assert len(signed_response) == 64, f"Expected 64-byte signature, got {len(signed_response)}"
 
     # Submit the response
     final_response = presentation_session.submit_response(signed_response)
@@ -182,8 +163,6 @@ def test_complete_reader_workflow(mdl_module, key_pair, test_mdl):
     # Verify the reader can handle the response
     result = mdl_module.handle_response(session_data.state, final_response)
     assert result is not None, "Response handling should not return None"
-    assert hasattr(result, "device_authentication"), "Result should have device_authentication"
-    assert hasattr(result, "verified_response"), "Result should have verified_response"
 
     # Validate authentication status
     auth_status = result.device_authentication
@@ -200,8 +179,27 @@ def test_complete_reader_workflow(mdl_module, key_pair, test_mdl):
     assert len(response_attrs) > 0, "Response should contain attributes"
 
     # Verify all permitted attributes are in response
-    for attr_name in permitted_items["org.iso.18013.5.1.mDL"]["org.iso.18013.5.1"]:
-        assert attr_name in response_attrs, f"Missing attribute in response: {attr_name}"
-        # Verify attribute has actual value
-        attr_value = response_attrs[attr_name]
-        assert attr_value is not None, f"Attribute {attr_name} should have a value"
+    permitted_attrs = WORKFLOW_PERMITTED_ITEMS["org.iso.18013.5.1.mDL"]["org.iso.18013.5.1"]
+    missing = set(permitted_attrs) - response_attrs.keys()
+    assert not missing, f"Missing attributes in response: {sorted(missing)}"
+    # Verify attributes have actual values; MDocItem.__eq__ can't compare against None,
+    # so check identity per item rather than `None in response_attrs.values()`
+    empty = [attr for attr in permitted_attrs if response_attrs[attr] is None]
+    assert not empty, f"Attributes should have values: {empty}"
+
+
+if __name__ == "__main__":
+    # Support direct execution for debugging
+    import sys
+
+    from utils import get_mdl_module
+
+    # Same guarded sys.path setup the mdl_module fixture uses
+    try:
+        get_mdl_module()
+    except ImportError as e:
+        print(f"❌ {e}")
+        print("Please run the build script first")
+        sys.exit(1)
+
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -11,18 +11,41 @@ State machine and session lifecycle tests for isomdl-uniffi Python bindings usin
 Tests session state transitions, lifecycle management, and concurrent session handling.
 """
 
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 
 import pytest
+from utils import (
+    FULL_NAME_PERMITTED_ITEMS,
+    FULL_NAME_REQUESTED_ITEMS,
+    GIVEN_NAME_PERMITTED_ITEMS,
+    GIVEN_NAME_REQUESTED_ITEMS,
+)
+
+
+@pytest.fixture
+def session_post_request(mdl_module, test_mdl, uuid_pool):
+    """
+    Provide a fresh presentation session that has handled a given_name request.
+
+    Returns (presentation_session, reader_session). Function-scoped, since the
+    tests go on to drive the holder session into further states.
+    """
+    presentation_session = mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool))
+    qr_uri = presentation_session.get_qr_code_uri()
+
+    reader_session = mdl_module.establish_session(qr_uri, GIVEN_NAME_REQUESTED_ITEMS, None)
+    presentation_session.handle_request(reader_session.request)
+
+    return presentation_session, reader_session
 
 
 class TestSessionLifecycle:
     """Test session creation, lifecycle, and cleanup."""
 
-    def test_session_creation(self, mdl_module, test_mdl):
+    def test_session_creation(self, mdl_module, test_mdl, uuid_pool):
         """Test that presentation session is created successfully."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         assert session is not None
@@ -31,12 +54,11 @@ class TestSessionLifecycle:
         assert qr_uri is not None
         assert len(qr_uri) > 0
 
-    def test_session_initialization_with_mdl(self, mdl_module, key_pair):
+    def test_session_initialization_with_mdl(self, mdl_module, test_mdl, uuid_pool):
         """Test that session properly initializes with MDL."""
-        mdl = mdl_module.generate_test_mdl(key_pair)
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
 
-        session = mdl_module.MdlPresentationSession(mdl, session_uuid)
+        session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         # Session should be able to generate identifiers
         qr_uri = session.get_qr_code_uri()
@@ -46,25 +68,21 @@ class TestSessionLifecycle:
         assert ble_ident is not None
         assert isinstance(ble_ident, bytes)
 
-    def test_session_complete_lifecycle(self, mdl_module, key_pair, test_mdl):
+    def test_session_complete_lifecycle(self, mdl_module, key_pair, test_mdl, uuid_pool):
         """Test complete session lifecycle from creation to completion."""
         # 1. Create session
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
         qr_uri = presentation_session.get_qr_code_uri()
 
         # 2. Establish reader session
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
+        reader_session = mdl_module.establish_session(qr_uri, FULL_NAME_REQUESTED_ITEMS, None)
 
         # 3. Handle request
         presentation_session.handle_request(reader_session.request)
 
         # 4. Generate response
-        permitted_items = {
-            "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
-        }
-        unsigned_response = presentation_session.generate_response(permitted_items)
+        unsigned_response = presentation_session.generate_response(FULL_NAME_PERMITTED_ITEMS)
 
         # 5. Sign and submit response
         signed_response = key_pair.sign(unsigned_response)
@@ -77,11 +95,11 @@ class TestSessionLifecycle:
         assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
         assert len(result.verified_response) > 0
 
-    def test_multiple_sessions_same_mdl(self, mdl_module, test_mdl):
+    def test_multiple_sessions_same_mdl(self, mdl_module, test_mdl, uuid_pool):
         """Test that same MDL can be used for multiple sessions."""
         # Create multiple sessions with same MDL
-        session1_uuid = str(uuid.uuid4())
-        session2_uuid = str(uuid.uuid4())
+        session1_uuid = next(uuid_pool)
+        session2_uuid = next(uuid_pool)
 
         session1 = mdl_module.MdlPresentationSession(test_mdl, session1_uuid)
         session2 = mdl_module.MdlPresentationSession(test_mdl, session2_uuid)
@@ -94,71 +112,50 @@ class TestSessionLifecycle:
         assert len(qr1) > 0
         assert len(qr2) > 0
 
-    def test_session_unique_identifiers(self, mdl_module, test_mdl):
+    @pytest.mark.parametrize("n", [2, pytest.param(5, marks=pytest.mark.very_slow)])
+    def test_session_unique_identifiers(self, mdl_module, test_mdl, uuid_pool, n):
         """Test that each session has unique identifiers."""
-        sessions = []
-        qr_uris = set()
-        ble_idents = set()
+        # Create n sessions
+        sessions = [mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool)) for _ in range(n)]
 
-        # Create 5 sessions
-        for _ in range(5):
-            session_uuid = str(uuid.uuid4())
-            session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-            sessions.append(session)
-
-            qr_uris.add(session.get_qr_code_uri())
-            ble_idents.add(session.get_ble_ident().hex())
+        qr_uris = {session.get_qr_code_uri() for session in sessions}
+        ble_idents = {session.get_ble_ident() for session in sessions}
 
         # All QR URIs should be unique
-        assert len(qr_uris) == 5
+        assert len(qr_uris) == n
         # All BLE identifiers should be unique
-        assert len(ble_idents) == 5
+        assert len(ble_idents) == n
 
 
 class TestInvalidStateTransitions:
     """Test that invalid state transitions are prevented."""
 
-    def test_generate_response_before_request(self, mdl_module, test_mdl):
+    def test_generate_response_before_request(self, mdl_module, test_mdl, uuid_pool):
         """Test that generating response before handling request fails."""
-        session_uuid = str(uuid.uuid4())
+        session_uuid = next(uuid_pool)
         presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
 
         # Try to generate response without handling request first
-        permitted_items = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
-
         # Should fail because no request has been handled
-        with pytest.raises((ValueError, RuntimeError, Exception)):
-            presentation_session.generate_response(permitted_items)
+        with pytest.raises(mdl_module.SignatureError):
+            presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
 
-    def test_submit_response_before_generate(self, mdl_module, key_pair, test_mdl):
+    def test_submit_response_before_generate(self, mdl_module, key_pair, session_post_request):
         """Test that submitting response before generating fails."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        presentation_session.handle_request(reader_session.request)
+        presentation_session, _ = session_post_request
 
         # Try to submit without generating first
         fake_data = b"not-a-real-response"
         signed_fake = key_pair.sign(fake_data)
 
         # Should fail because no response was generated
-        with pytest.raises((ValueError, RuntimeError, Exception)):
+        with pytest.raises(mdl_module.SignatureError):
             presentation_session.submit_response(signed_fake)
 
-    def test_handle_request_twice(self, mdl_module, test_mdl):
+    def test_handle_request_twice(self, session_post_request):
         """Test handling request twice on same session."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-
-        # Handle request first time (should work)
-        presentation_session.handle_request(reader_session.request)
+        # The fixture has already handled the request once
+        presentation_session, reader_session = session_post_request
 
         # Try to handle same request again
         # Implementation may allow this or reject it
@@ -166,29 +163,21 @@ class TestInvalidStateTransitions:
             presentation_session.handle_request(reader_session.request)
             # If allowed, it should not crash
 
-    def test_generate_response_twice(self, mdl_module, test_mdl):
+    def test_generate_response_twice(self, mdl_module, session_post_request):
         """Test generating response twice on same session."""
-        session_uuid = str(uuid.uuid4())
-        presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-        qr_uri = presentation_session.get_qr_code_uri()
-
-        requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-        reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-        presentation_session.handle_request(reader_session.request)
-
-        permitted_items = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
+        presentation_session, _ = session_post_request
 
         # Generate first time (should work)
-        response1 = presentation_session.generate_response(permitted_items)
+        response1 = presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
         assert isinstance(response1, bytes)
 
         # Try to generate again
         # May fail or succeed depending on implementation
         try:
-            response2 = presentation_session.generate_response(permitted_items)
+            response2 = presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
             # If allowed, responses might be different due to fresh signatures
             assert isinstance(response2, bytes)
-        except (ValueError, RuntimeError, Exception):
+        except mdl_module.SignatureError:
             # Rejection is also acceptable
             pass
 
@@ -196,74 +185,89 @@ class TestInvalidStateTransitions:
 class TestConcurrentSessions:
     """Test concurrent session handling."""
 
-    def test_multiple_simultaneous_sessions(self, mdl_module, key_pair, test_mdl):
+    def test_multiple_simultaneous_sessions(self, mdl_module, key_pair, test_mdl, uuid_pool):
         """Test multiple sessions running simultaneously."""
-        sessions = []
-        reader_sessions = []
-
         # Create 5 concurrent sessions
-        for _i in range(5):
-            session_uuid = str(uuid.uuid4())
-            presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
-            qr_uri = presentation_session.get_qr_code_uri()
-
-            requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-            reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-
-            sessions.append(presentation_session)
-            reader_sessions.append(reader_session)
-
-        # Process all sessions
+        sessions = [mdl_module.MdlPresentationSession(test_mdl, next(uuid_pool)) for _ in range(5)]
+        reader_sessions = [
+            mdl_module.establish_session(
+                session.get_qr_code_uri(), GIVEN_NAME_REQUESTED_ITEMS, None
+            )
+            for session in sessions
+        ]
+
+        # Advance every session one protocol step at a time, so all of them are
+        # mid-exchange together at each stage
+        unsigned_responses = []
         for presentation_session, reader_session in zip(sessions, reader_sessions):
             presentation_session.handle_request(reader_session.request)
+            unsigned_responses.append(
+                presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
+            )
 
-            permitted_items = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
+        signatures = [key_pair.sign(unsigned) for unsigned in unsigned_responses]
 
-            unsigned = presentation_session.generate_response(permitted_items)
-            signed = key_pair.sign(unsigned)
-            final_response = presentation_session.submit_response(signed)
+        final_responses = [
+            presentation_session.submit_response(signed)
+            for presentation_session, signed in zip(sessions, signatures)
+        ]
 
+        for reader_session, final_response in zip(reader_sessions, final_responses):
             result = mdl_module.handle_response(reader_session.state, final_response)
             assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
 
-    def test_concurrent_different_mdls(self, mdl_module, key_pair):
+    def test_threaded_sessions(self, mdl_module, key_pair, test_mdl, uuid_pool):
+        """Test complete exchanges running on several threads at once."""
+
+        def run_exchange(session_uuid):
+            presentation_session = mdl_module.MdlPresentationSession(test_mdl, session_uuid)
+            reader_session = mdl_module.establish_session(
+                presentation_session.get_qr_code_uri(), GIVEN_NAME_REQUESTED_ITEMS, None
+            )
+            presentation_session.handle_request(reader_session.request)
+            unsigned = presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
+            final_response = presentation_session.submit_response(key_pair.sign(unsigned))
+            return mdl_module.handle_response(reader_session.state, final_response)
+
+        # ctypes releases the GIL for the duration of each FFI call, so the Rust work
+        # genuinely overlaps. Draw UUIDs up front; the pool iterator is not thread-safe.
+        session_uuids = [next(uuid_pool) for _ in range(5)]
+        with ThreadPoolExecutor(max_workers=len(session_uuids)) as executor:
+            results = list(executor.map(run_exchange, session_uuids))
+
+        for result in results:
+            assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
+
+    def test_concurrent_different_mdls(self, mdl_module, key_pair, uuid_pool):
         """Test concurrent sessions with different MDLs."""
         # Create multiple MDLs
         mdls = [mdl_module.generate_test_mdl(key_pair) for _ in range(3)]
 
-        sessions = []
-        reader_sessions = []
-
         # Create session for each MDL
-        for mdl in mdls:
-            session_uuid = str(uuid.uuid4())
-            presentation_session = mdl_module.MdlPresentationSession(mdl, session_uuid)
-            qr_uri = presentation_session.get_qr_code_uri()
-
-            requested_items = {"org.iso.18013.5.1": {"given_name": True}}
-            reader_session = mdl_module.establish_session(qr_uri, requested_items, None)
-
-            sessions.append(presentation_session)
-            reader_sessions.append(reader_session)
+        sessions = [mdl_module.MdlPresentationSession(mdl, next(uuid_pool)) for mdl in mdls]
+        reader_sessions = [
+            mdl_module.establish_session(
+                session.get_qr_code_uri(), GIVEN_NAME_REQUESTED_ITEMS, None
+            )
+            for session in sessions
+        ]
 
         # All sessions should complete independently
         for presentation_session, reader_session in zip(sessions, reader_sessions):
             presentation_session.handle_request(reader_session.request)
 
-            permitted_items = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
-
-            unsigned = presentation_session.generate_response(permitted_items)
+            unsigned = presentation_session.generate_response(GIVEN_NAME_PERMITTED_ITEMS)
             signed = key_pair.sign(unsigned)
             final_response = presentation_session.submit_response(signed)
 
             result = mdl_module.handle_response(reader_session.state, final_response)
             assert result.device_authentication == mdl_module.AuthenticationStatus.VALID
 
-    def test_session_independence(self, mdl_module, key_pair, test_mdl):
+    def test_session_independence(self, mdl_module, key_pair, test_mdl, uuid_pool):
         """Test that concurrent sessions don't interfere with each other."""
         # Create two sessions
-        session1_uuid = str(uuid.uuid4())
-        session2_uuid = str(uuid.uuid4())
+        session1_uuid = next(uuid_pool)
+        session2_uuid = next(uuid_pool)
 
         session1 = mdl_module.MdlPresentationSession(test_mdl, session1_uuid)
         session2 = mdl_module.MdlPresentationSession(test_mdl, session2_uuid)
@@ -272,21 +276,18 @@ class TestConcurrentSessions:
         qr2 = session2.get_qr_code_uri()
 
         # Establish both reader sessions
-        requested_items = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
-
-        reader1 = mdl_module.establish_session(qr1, requested_items, None)
-        reader2 = mdl_module.establish_session(qr2, requested_items, None)
+        reader1 = mdl_module.establish_session(qr1, FULL_NAME_REQUESTED_ITEMS, None)
+        reader2 = mdl_module.establish_session(qr2, FULL_NAME_REQUESTED_ITEMS, None)
 
         # Process session1 fully
         session1.handle_request(reader1.request)
-        permitted = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}}
-        unsigned1 = session1.generate_response(permitted)
+        unsigned1 = session1.generate_response(FULL_NAME_PERMITTED_ITEMS)
         signed1 = key_pair.sign(unsigned1)
         response1 = session1.submit_response(signed1)
 
         # Process session2 fully
         session2.handle_request(reader2.request)
-        unsigned2 = session2.generate_response(permitted)
+        unsigned2 = session2.generate_response(FULL_NAME_PERMITTED_ITEMS)
         signed2 = key_pair.sign(unsigned2)
         response2 = session2.submit_response(signed2)
 
@@ -4,28 +4,22 @@
 import sys
 from pathlib import Path
 
+# Request/permit shapes shared across the test modules. The bindings only read these,
+# so one instance of each is reused rather than rebuilding the literals in every test.
+GIVEN_NAME_REQUESTED_ITEMS = {"org.iso.18013.5.1": {"given_name": True}}
+FULL_NAME_REQUESTED_ITEMS = {"org.iso.18013.5.1": {"given_name": True, "family_name": True}}
+GIVEN_NAME_PERMITTED_ITEMS = {"org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name"]}}
+FULL_NAME_PERMITTED_ITEMS = {
+    "org.iso.18013.5.1.mDL": {"org.iso.18013.5.1": ["given_name", "family_name"]}
+}
+
 
 def get_project_root() -> Path:
     """
-    Find the project root by looking for the rust directory.
+    Return the repository root, i.e. the directory containing rust/ and python/.
     """
-    current_dir = Path.cwd()
-    project_root = current_dir
-
-    # Look for rust directory to identify project root
-    max_levels = 5
-    for _ in range(max_levels):
-        rust_dir = project_root / "rust"
-        if rust_dir.exists() and rust_dir.is_dir():
-            return project_root
-        parent = project_root.parent
-        if parent == project_root:
-            break
-        project_root = parent
-
-    # Fallback logic if not found via traversal (e.g. when running from a different location)
-    # Assuming this file is in python/tests/utils.py
-    return Path(__file__).parent.parent.parent
+    # This file lives in python/tests/utils.py
+    return Path(__file__).resolve().parents[2]
 
 
 def get_mdl_module(project_root: Path = None):
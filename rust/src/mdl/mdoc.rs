@@ -337,6 +337,15 @@ impl Mdoc {
         }
     }
 
+    /// Serialize to raw CBOR bytes.
+    ///
+    /// The inverse of [`Mdoc::from_cbor_encoded_document`]. Prefer this over
+    /// `stringify` when the caller needs the CBOR itself, as it avoids the
+    /// string encoding on this side and the matching decode on the caller's.
+    pub fn cbor_bytes(&self) -> Result<Vec<u8>, crate::mdl::mdoc::MdocEncodingError> {
+        isomdl::cbor::to_vec(&self.inner).map_err(|_| MdocEncodingError::DocumentCborEncoding)
+    }
+
     /// Verify the issuer signature of this mdoc credential.
     ///
     /// This method extracts the X5Chain from the issuer_auth header, validates it
@@ -1017,6 +1026,12 @@ mod tests {
             .find(|e| e.identifier == "custom-element")
             .expect("Element not found");
         assert!(element.value.as_ref().unwrap().contains("custom-value"));
+
+        // 6. Raw CBOR round-trips through from_cbor_encoded_document
+        let cbor = mdoc.cbor_bytes().expect("Failed to encode mdoc as CBOR");
+        let decoded = Mdoc::from_cbor_encoded_document(cbor, mdoc.key_alias()).unwrap();
+        assert_eq!(decoded.doctype(), "com.example.doc");
+        assert_eq!(decoded.id(), mdoc.id());
     }
 
     #[test]